@@ -1,35 +1,48 @@
-from fastapi import FastAPI
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
 from . import __version__, __build_time__
 import os, platform, time
 from datetime import datetime, timezone
+import orjson
 
-app = FastAPI(title="SENKRONX_PLUS API", version=__version__)
+app = FastAPI(
+    title="SENKRONX_PLUS API",
+    version=__version__,
+    default_response_class=ORJSONResponse,
+)
+
+# Süreç ömrü boyunca değişmeyen değerler bir kez okunur
+_NODE = platform.node()
+_PY_VER = platform.python_version()
+_STARTED = float(os.environ.get("APP_STARTED_AT", time.time()))
+_STARTED_AT = datetime.fromtimestamp(_STARTED, tz=timezone.utc).isoformat()
+
+# Sabit sağlık yanıtı bir kez serileştirilir; her istekte yalnızca bayt kopyalanır
+_HEALTHZ_BYTES = orjson.dumps(
+    {
+        "status": "ok",
+        "services": {
+            "api": True,
+            "ml_core": False,  # Devin tamamlayacak
+            "db": False,       # opsiyonel
+        },
+        "notes": "SENKRON bootstrap sağlıklı. Çekirdek modüller iskelet halinde.",
+    }
+)
 
 @app.get("/version")
-def version():
-    started = float(os.environ.get("APP_STARTED_AT", time.time()))
-    uptime = time.time() - started
-    return {
+async def version():
+    payload = {
         "version": __version__,
         "time": datetime.now(timezone.utc).isoformat(),
-        "uptime_sec": uptime,
-        "started_at": datetime.fromtimestamp(started, tz=timezone.utc).isoformat(),
+        "uptime_sec": time.time() - _STARTED,
+        "started_at": _STARTED_AT,
         "name": "SENKRONX_PLUS API",
-        "node": platform.node(),
-        "python": platform.python_version(),
+        "node": _NODE,
+        "python": _PY_VER,
     }
+    return Response(content=orjson.dumps(payload), media_type="application/json")
 
 @app.get("/healthz/details")
-def healthz_details():
-    return JSONResponse(
-        {
-            "status": "ok",
-            "services": {
-                "api": True,
-                "ml_core": False,  # Devin tamamlayacak
-                "db": False,       # opsiyonel
-            },
-            "notes": "SENKRON bootstrap sağlıklı. Çekirdek modüller iskelet halinde.",
-        }
-    )
+async def healthz_details():
+    return Response(content=_HEALTHZ_BYTES, media_type="application/json")
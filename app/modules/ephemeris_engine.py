@@ -12,9 +12,11 @@ Ephemeris verileri: DE440s (öncelik), DE421 (yedek)
 import logging
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Optional, Tuple
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
-from skyfield.api import Loader, utc
+import numpy as np
+from skyfield.api import Loader
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +38,9 @@ CELESTIAL_BODIES = {
     'pluto': 'pluto barycenter'
 }
 
+# compute_positions_range için tek çağrıda üretilebilecek en fazla zaman noktası
+_MAX_RANGE_POINTS = 100_000
+
 @dataclass
 class BodyPosition:
     """Gök cismi pozisyon bilgileri (kullanıcı API'si için)"""
@@ -49,25 +54,42 @@ class BodyPosition:
 
 _loader = None
 _ephemeris = None
+_timescale = None
+_body_handles: Dict[str, Any] = {}
 
 def _get_ephemeris():
     """Ephemeris verilerini yükler (DE440s öncelik, DE421 yedek)"""
-    global _loader, _ephemeris
+    global _loader, _ephemeris, _timescale, _body_handles
 
     if _ephemeris is not None:
         return _ephemeris
 
     try:
-        _loader = Loader('~/skyfield-data', verbose=False)
+        # Tüm durum önce yerel değişkenlerde kurulur ve ancak başarıyla bittiğinde
+        # yayınlanır; _ephemeris en son atanır, böylece eşzamanlı bir çağıran
+        # yarım kurulmuş tutamaçları asla görmez
+        loader = Loader('~/skyfield-data', verbose=False)
 
         try:
-            _ephemeris = _loader('de440s.bsp')
+            ephemeris = loader('de440s.bsp')
             logger.info("DE440s ephemeris yüklendi")
         except Exception as e:
             logger.warning(f"DE440s yüklenemedi: {e}, DE421 deneniyor...")
-            _ephemeris = _loader('de421.bsp')
+            ephemeris = loader('de421.bsp')
             logger.info("DE421 ephemeris yüklendi")
 
+        # Zaman ölçeği ve gök cismi tutamaçları süreç boyunca sabittir; bir kez oluşturulur
+        timescale = loader.timescale()
+        body_handles = {
+            name: ephemeris[target] for name, target in CELESTIAL_BODIES.items()
+        }
+        body_handles['earth'] = ephemeris['earth']
+
+        _loader = loader
+        _timescale = timescale
+        _body_handles = body_handles
+        _ephemeris = ephemeris
+
         return _ephemeris
 
     except Exception as e:
@@ -99,6 +121,20 @@ def degrees_to_zodiac(angle_deg: float) -> Dict[str, Any]:
         "second": seconds
     }
 
+def degrees_to_zodiac_batch(angles: Any) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Derece dizisini vektörel olarak burç bileşenlerine çevirir
+
+    Dönüş: (burç indeksi, derece, dakika, saniye) dizileri.
+    """
+    angles = np.mod(np.asarray(angles, dtype=np.float64), 360.0)
+    sign_index = (angles // 30.0).astype(np.int64) % 12
+    deg_in_sign = np.mod(angles, 30.0)
+    degrees = deg_in_sign.astype(np.int64)
+    minutes_float = (deg_in_sign - degrees) * 60.0
+    minutes = minutes_float.astype(np.int64)
+    seconds = (minutes_float - minutes) * 60.0
+    return sign_index, degrees, minutes, seconds
+
 def deg_to_sign(angle_deg: float) -> Tuple[int, str, float, Tuple[int, int, float]]:
     """Derece değerini burç bilgilerine çevirir (kullanıcı API'si)"""
     angle_deg = angle_deg % 360.0
@@ -108,54 +144,112 @@ def deg_to_sign(angle_deg: float) -> Tuple[int, str, float, Tuple[int, int, floa
     degrees, minutes, seconds = degrees_to_dms(deg_in_sign)
     return sign_index, sign_name, deg_in_sign, (degrees, minutes, seconds)
 
+def _sample_longitudes(times: List[datetime], body_names: List[str]) -> Dict[str, np.ndarray]:
+    """Verilen zamanlarda gök cisimlerinin ekliptik boylamlarını örnekler
+
+    Dünya konumu tüm zamanlar için tek bir vektörel çağrıda bir kez hesaplanır
+    ve her gök cismi aynı gözlemciden izlenir. Hesaplanamayan cisimler loglanıp
+    sonuçtan çıkarılır; ephemeris yüklenemezse istisna fırlatılır.
+    """
+    _get_ephemeris()
+    observer = _body_handles['earth'].at(_timescale.from_datetimes(times))
+
+    longitudes = {}
+    for body_name in body_names:
+        try:
+            apparent = observer.observe(_body_handles[body_name]).apparent()
+            lat, lon, distance = apparent.ecliptic_latlon()
+            longitudes[body_name] = lon.degrees
+        except Exception as e:
+            logger.error(f"Pozisyon hesaplama hatası {body_name}: {e}")
+
+    return longitudes
+
+def _retrograde_sample_times(when: datetime, delta_days: float) -> List[datetime]:
+    """Retrograd türevi için [when, when + delta_days] UTC örnek zamanlarını döndürür"""
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return [when, when + timedelta(days=delta_days)]
+
+@lru_cache(maxsize=4096)
 def _calculate_retrograde(planet_name: str, when: datetime, delta_days: float = 1.0) -> bool:
-    """Retrograd durumunu hesaplar (boylam türevinden)"""
-    try:
-        if planet_name in ['sun', 'moon']:
-            return False
+    """Retrograd durumunu hesaplar (boylam türevinden)
 
-        ephemeris = _get_ephemeris()
-        earth = ephemeris['earth']
+    Hata durumunda istisna fırlatır; böylece önbelleğe yalnızca başarılı
+    hesaplamalar girer.
+    """
+    if planet_name in ['sun', 'moon']:
+        return False
 
-        ts = _loader.timescale()
-        t1 = ts.from_datetime(when.replace(tzinfo=utc))
-        t2 = ts.from_datetime((when + timedelta(days=delta_days)).replace(tzinfo=utc))
+    if planet_name not in CELESTIAL_BODIES:
+        return False
 
-        if planet_name in CELESTIAL_BODIES:
-            planet = ephemeris[CELESTIAL_BODIES[planet_name]]
-        else:
-            return False
+    samples = _sample_longitudes(_retrograde_sample_times(when, delta_days), [planet_name])
+    lon = samples[planet_name]
+    return _is_retrograde_motion(float(lon[0]), float(lon[1]), delta_days)
 
-        astrometric1 = earth.at(t1).observe(planet)
-        apparent1 = astrometric1.apparent()
-        lat1, lon1, distance1 = apparent1.ecliptic_latlon()
+def _is_retrograde_motion(lon1_deg: float, lon2_deg: float, delta_days: float) -> bool:
+    """İki boylam örneği arasındaki türevin negatif olup olmadığını döndürür"""
+    # 0°/360° geçişi dallanmadan katlanır: fark her zaman [-180, 180) aralığında
+    derivative = (((lon2_deg - lon1_deg + 180.0) % 360.0) - 180.0) / delta_days
+    return bool(derivative < 0)
 
-        astrometric2 = earth.at(t2).observe(planet)
-        apparent2 = astrometric2.apparent()
-        lat2, lon2, distance2 = apparent2.ecliptic_latlon()
+def _retrograde_flags(samples: Dict[str, np.ndarray], delta_days: float) -> Dict[str, bool]:
+    """İki zamanlı boylam örneklerinden tüm gök cisimleri için retrograd bayraklarını üretir"""
+    return {
+        name: (
+            name not in ['sun', 'moon']
+            and name in samples
+            and _is_retrograde_motion(float(samples[name][0]), float(samples[name][1]), delta_days)
+        )
+        for name in CELESTIAL_BODIES
+    }
 
-        lon1_deg = float(lon1.degrees)
-        lon2_deg = float(lon2.degrees)
+def compute_all_retrogrades(when: datetime, delta_days: float = 1.0) -> Dict[str, bool]:
+    """Tüm gök cisimlerinin retrograd durumunu tek geçişte hesaplar
 
-        if abs(lon2_deg - lon1_deg) > 180:
-            if lon2_deg > lon1_deg:
-                lon1_deg += 360
-            else:
-                lon2_deg += 360
+    Dünya konumu iki zaman noktası için yalnızca bir kez hesaplanır ve
+    tüm gök cisimleri bu gözlemciden izlenir.
+    """
+    try:
+        planets = [name for name in CELESTIAL_BODIES if name not in ['sun', 'moon']]
+        samples = _sample_longitudes(_retrograde_sample_times(when, delta_days), planets)
+        return _retrograde_flags(samples, delta_days)
 
-        derivative = (lon2_deg - lon1_deg) / delta_days
-        return bool(derivative < 0)
+    except Exception as e:
+        logger.warning(f"Toplu retrograd hesaplama hatası: {e}")
+        return {name: False for name in CELESTIAL_BODIES}
+
+def is_retrograde(planet_name: str, when: datetime) -> bool:
+    """Retrograd durumunu kontrol eder (test API'si)
+
+    Sonuçlar (gök cismi, saniye çözünürlüğündeki UTC zaman) anahtarıyla önbelleklenir.
+    """
+    if not isinstance(when, datetime):
+        return False
+
+    try:
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        elif when.tzinfo != timezone.utc:
+            when = when.astimezone(timezone.utc)
+
+        return _calculate_retrograde(planet_name, when.replace(microsecond=0))
 
     except Exception as e:
         logger.warning(f"Retrograd hesaplama hatası {planet_name}: {e}")
         return False
 
-def is_retrograde(planet_name: str, when: datetime) -> bool:
-    """Retrograd durumunu kontrol eder (test API'si)"""
-    return _calculate_retrograde(planet_name, when)
+def compute_positions(
+    when: Optional[datetime],
+    location: Optional[Dict[str, float]] = None,
+    include_retrograde: bool = False,
+) -> Dict[str, Any]:
+    """Belirtilen zamandaki gezegen pozisyonlarını hesaplar (test API'si)
 
-def compute_positions(when: Optional[datetime], location: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
-    """Belirtilen zamandaki gezegen pozisyonlarını hesaplar (test API'si)"""
+    include_retrograde=True verilirse her gök cismine "retrograde" alanı eklenir.
+    Sonuçlar saniye çözünürlüğündeki UTC zamana göre önbelleklenir.
+    """
     try:
         if when is None:
             return {"error": "Geçersiz tarih"}
@@ -165,57 +259,142 @@ def compute_positions(when: Optional[datetime], location: Optional[Dict[str, flo
         elif when.tzinfo != timezone.utc:
             when = when.astimezone(timezone.utc)
 
-        ephemeris = _get_ephemeris()
-        earth = ephemeris['earth']
-        ts = _loader.timescale()
-        t = ts.from_datetime(when)
+        cached = _compute_positions_cached(when.replace(microsecond=0), include_retrograde)
+
+        # Önbellekteki sözlük çağıranlar tarafından değiştirilemesin diye kopyalanır;
+        # zaman damgası kesilmiş anahtardan değil, çağıranın zamanından üretilir
+        result = {
+            "timestamp": when.isoformat(),
+            "positions": {
+                name: {**body_pos, "zodiac": dict(body_pos["zodiac"])}
+                for name, body_pos in cached.items()
+            }
+        }
+
+        if location:
+            result["location"] = location
 
-        positions = {}
+        return result
 
-        for body_name in CELESTIAL_BODIES.keys():
-            try:
-                if body_name == 'sun':
-                    planet = ephemeris['sun']
-                elif body_name == 'moon':
-                    planet = ephemeris['moon']
-                else:
-                    planet = ephemeris[CELESTIAL_BODIES[body_name]]
+    except Exception as e:
+        logger.error(f"compute_positions hatası: {e}")
+        return {"error": str(e)}
 
-                astrometric = earth.at(t).observe(planet)
-                apparent = astrometric.apparent()
-                lat, lon, distance = apparent.ecliptic_latlon()
+@lru_cache(maxsize=4096)
+def _compute_positions_cached(when: datetime, include_retrograde: bool) -> Dict[str, Dict[str, Any]]:
+    """UTC zamanı için gök cismi pozisyonlarını hesaplar; ephemeris hatasında istisna fırlatır
 
-                lon_deg = float(lon.degrees)
-                if lon_deg < 0:
-                    lon_deg += 360.0
-                elif lon_deg >= 360:
-                    lon_deg -= 360.0
+    Retrograd istenirse pozisyonlar ve bayraklar aynı [t, t+1 gün] değerlendirmesinden
+    türetilir; Dünya konumu ikinci kez hesaplanmaz.
+    """
+    delta_days = 1.0
+    times = _retrograde_sample_times(when, delta_days) if include_retrograde else [when]
+    samples = _sample_longitudes(times, list(CELESTIAL_BODIES.keys()))
+    retrogrades = _retrograde_flags(samples, delta_days) if include_retrograde else None
 
-                zodiac_info = degrees_to_zodiac(lon_deg)
+    positions = {}
 
-                body_pos = {
-                    "longitude": lon_deg,
-                    "zodiac": zodiac_info
-                }
+    for body_name in CELESTIAL_BODIES.keys():
+        if body_name not in samples:
+            continue
 
-                positions[body_name] = body_pos
+        lon_deg = float(samples[body_name][0])
+        if lon_deg < 0:
+            lon_deg += 360.0
+        elif lon_deg >= 360:
+            lon_deg -= 360.0
 
-            except Exception as e:
-                logger.error(f"Pozisyon hesaplama hatası {body_name}: {e}")
-                continue
+        zodiac_info = degrees_to_zodiac(lon_deg)
 
-        result = {
-            "timestamp": when.isoformat(),
-            "positions": positions
+        body_pos = {
+            "longitude": lon_deg,
+            "zodiac": zodiac_info
         }
+        if retrogrades is not None:
+            body_pos["retrograde"] = retrogrades[body_name]
 
-        if location:
-            result["location"] = location
+        positions[body_name] = body_pos
 
-        return result
+    return positions
+
+def _positions_table(times: List[datetime]) -> Dict[str, Any]:
+    """Verilen UTC zamanları için (N, gök cismi sayısı) boylam tablosunu hesaplar
+
+    Dizi alanları np.ndarray olarak döner; sonuç dahili (vektörel) kullanım içindir
+    ve doğrudan JSON'a serileştirilemez.
+    """
+    _get_ephemeris()
+    observer = _body_handles['earth'].at(_timescale.from_datetimes(times))
+
+    bodies = list(CELESTIAL_BODIES.keys())
+    longitudes = np.empty((len(times), len(bodies)), dtype=np.float64)
+    for column, body_name in enumerate(bodies):
+        apparent = observer.observe(_body_handles[body_name]).apparent()
+        lat, lon, distance = apparent.ecliptic_latlon()
+        longitudes[:, column] = np.mod(lon.degrees, 360.0)
+
+    sign_index, degrees, minutes, seconds = degrees_to_zodiac_batch(longitudes)
+
+    return {
+        "timestamps": [t.isoformat() for t in times],
+        "bodies": bodies,
+        "longitudes": longitudes,
+        "sign_index": sign_index,
+        "degree": degrees,
+        "minute": minutes,
+        "second": seconds
+    }
+
+def compute_positions_batch(whens: List[datetime]) -> Dict[str, Any]:
+    """Birden çok zaman için tüm gök cisimlerinin boylamlarını tek çağrıda hesaplar
+
+    Tek tek compute_positions çağırmak yerine tüm zamanlar tek bir vektörel
+    Skyfield değerlendirmesinde işlenir. Dahili kullanım içindir: tablo alanları
+    np.ndarray'dir, API yanıtı olarak dönmeden önce .tolist() ile çevrilmelidir.
+    """
+    try:
+        if not whens or any(when is None for when in whens):
+            return {"error": "Geçersiz tarih"}
+
+        times = [
+            when.replace(tzinfo=timezone.utc) if when.tzinfo is None else when.astimezone(timezone.utc)
+            for when in whens
+        ]
+        return _positions_table(times)
 
     except Exception as e:
-        logger.error(f"compute_positions hatası: {e}")
+        logger.error(f"compute_positions_batch hatası: {e}")
+        return {"error": str(e)}
+
+def compute_positions_range(start: datetime, end: datetime, step_days: float = 1.0) -> Dict[str, Any]:
+    """Zaman aralığı boyunca tüm gök cisimlerinin boylamlarını tablo olarak hesaplar
+
+    Zaman tüneli taramaları için tasarlanmıştır: tüm zaman noktaları tek bir
+    vektörel Skyfield çağrısında değerlendirilir ve (N, gök cismi sayısı)
+    boyutlu diziler döner. Dahili kullanım içindir: tablo alanları np.ndarray'dir,
+    API yanıtı olarak dönmeden önce .tolist() ile çevrilmelidir.
+    """
+    try:
+        if step_days <= 0:
+            return {"error": "step_days pozitif olmalı"}
+
+        if start.tzinfo is None:
+            start = start.replace(tzinfo=timezone.utc)
+        if end.tzinfo is None:
+            end = end.replace(tzinfo=timezone.utc)
+        if end < start:
+            return {"error": "Bitiş tarihi başlangıçtan önce"}
+
+        count = int((end - start) / timedelta(days=step_days)) + 1
+        if count > _MAX_RANGE_POINTS:
+            return {"error": f"Aralık en fazla {_MAX_RANGE_POINTS} zaman noktası içerebilir"}
+        start = start.astimezone(timezone.utc)
+        times = [start + timedelta(days=step_days * i) for i in range(count)]
+
+        return _positions_table(times)
+
+    except Exception as e:
+        logger.error(f"compute_positions_range hatası: {e}")
         return {"error": str(e)}
 
 def compute_houses_whole_sign(ascendant_deg: float) -> Dict[str, Any]:
@@ -248,7 +427,14 @@ def compute_houses_placidus(when: datetime, location: Dict[str, float]) -> Dict[
     }
 
 def ready() -> bool:
-    """Modülün hazır olup olmadığını döndürür"""
+    """Modülün hazır olup olmadığını döndürür
+
+    Ephemeris yüklendikten sonra yalnızca durum kontrol edilir; yüklü değilse
+    yükleme denenir ve hata durumunda sonraki çağrı yeniden dener.
+    """
+    if _ephemeris is not None:
+        return True
+
     try:
         _get_ephemeris()
         return True
@@ -0,0 +1,73 @@
+"""ephemeris_engine testleri
+
+Buradaki durumlar ephemeris çekirdek dosyası (BSP) gerektirmez.
+"""
+
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from app.modules.ephemeris_engine import (
+    _MAX_RANGE_POINTS,
+    ZODIAC_SIGNS,
+    compute_positions_batch,
+    compute_positions_range,
+    degrees_to_zodiac,
+    degrees_to_zodiac_batch,
+)
+
+ANGLES = [0.0, 29.9999, 30.0, 123.456, 359.9999, -0.0001, -10.0, -390.5, 725.25]
+
+
+class TestDegreesToZodiacBatch:
+    """degrees_to_zodiac_batch skaler degrees_to_zodiac ile aynı sonucu vermeli"""
+
+    def test_matches_scalar_elementwise(self):
+        sign_index, degrees, minutes, seconds = degrees_to_zodiac_batch(ANGLES)
+
+        for i, angle in enumerate(ANGLES):
+            expected = degrees_to_zodiac(angle)
+            assert ZODIAC_SIGNS[sign_index[i]] == expected["sign"]
+            assert sign_index[i] == expected["sign_index"]
+            assert degrees[i] == expected["degree"]
+            assert minutes[i] == expected["minute"]
+            assert seconds[i] == pytest.approx(expected["second"], abs=1e-6)
+
+    def test_preserves_shape(self):
+        angles = np.array(ANGLES[:8]).reshape(2, 4)
+        for column in degrees_to_zodiac_batch(angles):
+            assert column.shape == (2, 4)
+
+
+class TestComputePositionsRangeGuards:
+    """Geçersiz argümanlar ephemeris yüklenmeden hata sözlüğü döndürmeli"""
+
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    end = datetime(2024, 1, 2, tzinfo=timezone.utc)
+
+    @pytest.mark.parametrize("step_days", [0, -1.0])
+    def test_non_positive_step(self, step_days):
+        result = compute_positions_range(self.start, self.end, step_days=step_days)
+        assert "error" in result
+
+    def test_end_before_start(self):
+        result = compute_positions_range(self.end, self.start)
+        assert "error" in result
+
+    def test_too_many_points(self):
+        step_days = 1.0 / (_MAX_RANGE_POINTS * 2)
+        result = compute_positions_range(self.start, self.end, step_days=step_days)
+        assert "error" in result
+        assert str(_MAX_RANGE_POINTS) in result["error"]
+
+
+class TestComputePositionsBatchGuards:
+    """Boş liste ya da None içeren liste ephemeris yüklenmeden reddedilmeli"""
+
+    def test_empty_list(self):
+        assert "error" in compute_positions_batch([])
+
+    def test_none_element(self):
+        whens = [datetime(2024, 1, 1, tzinfo=timezone.utc), None]
+        assert "error" in compute_positions_batch(whens)